@@ -37,6 +37,8 @@ T = TypeVar("T")
 
 @dataclass
 class Expression:
+    __slots__ = ("expression",)
+
     expression: Expr
 
     def accept(self, visitor: "StmtVisitor[T]") -> T:
@@ -45,6 +47,8 @@ class Expression:
 
 @dataclass
 class Class:
+    __slots__ = ("name", "superclass", "methods")
+
     name: Token
     superclass: Optional["Variable"]
     methods: List["Function"]
@@ -55,6 +59,8 @@ class Class:
 
 @dataclass
 class If:
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     condition: Expr
     then_branch: Stmt
     else_branch: Optional[Stmt]
@@ -65,6 +71,8 @@ class If:
 
 @dataclass
 class Print:
+    __slots__ = ("expression",)
+
     expression: Expr
 
     def accept(self, visitor: "StmtVisitor[T]") -> T:
@@ -73,6 +81,8 @@ class Print:
 
 @dataclass
 class While:
+    __slots__ = ("condition", "body")
+
     condition: Expr
     body: Stmt
 
@@ -82,6 +92,8 @@ class While:
 
 @dataclass
 class Var:
+    __slots__ = ("name", "initializer")
+
     name: Token
     initializer: Optional[Expr]
 
@@ -91,6 +103,8 @@ class Var:
 
 @dataclass
 class Block:
+    __slots__ = ("statements",)
+
     statements: List[Stmt]
 
     def accept(self, visitor: "StmtVisitor[T]") -> T:
@@ -99,6 +113,8 @@ class Block:
 
 @dataclass
 class Function:
+    __slots__ = ("name", "params", "body")
+
     name: Token
     params: List[Token]
     body: List[Stmt]
@@ -109,6 +125,8 @@ class Function:
 
 @dataclass
 class Return:
+    __slots__ = ("keyword", "value")
+
     keyword: Token
     value: Optional[Expr]
 
@@ -118,6 +136,8 @@ class Return:
 
 @dataclass
 class Binary:
+    __slots__ = ("left", "operator", "right")
+
     left: Expr
     operator: Token
     right: Expr
@@ -128,6 +148,8 @@ class Binary:
 
 @dataclass
 class Logical:
+    __slots__ = ("left", "operator", "right")
+
     left: Expr
     operator: Token
     right: Expr
@@ -138,6 +160,8 @@ class Logical:
 
 @dataclass
 class Grouping:
+    __slots__ = ("expression",)
+
     expression: Expr
 
     def accept(self, visitor: "ExprVisitor[T]") -> T:
@@ -146,6 +170,8 @@ class Grouping:
 
 @dataclass
 class Literal:
+    __slots__ = ("value",)
+
     value: Any
 
     def accept(self, visitor: "ExprVisitor[T]") -> T:
@@ -154,6 +180,8 @@ class Literal:
 
 @dataclass
 class Variable:
+    __slots__ = ("name",)
+
     name: Token
 
     def accept(self, visitor: "ExprVisitor[T]") -> T:
@@ -162,6 +190,8 @@ class Variable:
 
 @dataclass
 class Unary:
+    __slots__ = ("operator", "right")
+
     operator: Token
     right: Expr
 
@@ -171,6 +201,8 @@ class Unary:
 
 @dataclass
 class Call:
+    __slots__ = ("callee", "token", "arguments")
+
     callee: Expr
     token: Token
     arguments: List[Expr]
@@ -181,6 +213,8 @@ class Call:
 
 @dataclass
 class Assign:
+    __slots__ = ("name", "value")
+
     name: Token
     value: Expr
 
@@ -190,6 +224,8 @@ class Assign:
 
 @dataclass
 class Set:
+    __slots__ = ("object", "name", "value")
+
     object: Expr
     name: Token
     value: Expr
@@ -200,6 +236,8 @@ class Set:
 
 @dataclass
 class Get:
+    __slots__ = ("object", "name")
+
     object: Expr
     name: Token
 
@@ -209,6 +247,8 @@ class Get:
 
 @dataclass
 class This:
+    __slots__ = ("keyword",)
+
     keyword: Token
 
     def accept(self, visitor: "ExprVisitor[T]") -> T:
@@ -217,6 +257,8 @@ class This:
 
 @dataclass
 class Super:
+    __slots__ = ("keyword", "method")
+
     keyword: Token
     method: Token
 
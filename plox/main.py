@@ -1,5 +1,5 @@
+import os
 import sys
-from pathlib import Path
 
 from plox.scanner import Scanner
 from plox.parser import Parser
@@ -9,49 +9,70 @@ from plox.resolver import Resolver
 
 from plox.pprinter import LispPrinter
 
+# Print the parsed program as lisp before running it
+DEBUG = os.environ.get("PLOX_DEBUG", "") not in ("", "0")
+
+_PPRINTER = LispPrinter()
+
 
 def run(source):
+    g = Globals
     scanner = Scanner(source)
     tokens = scanner.scan_tokens()
     parser = Parser(tokens)
     result = parser.parse()
 
-    if result is None or Globals.had_error:
+    if result is None or g.had_error:
         return
 
+    if DEBUG:
+        _PPRINTER.reset()
+        sys.stdout.write(_PPRINTER.print_program(result))
+        sys.stdout.write("\n")
+
     interpreter = Interpreter()
     resolver = Resolver(interpreter)
     resolver.resolve_list(result)
 
-    if Globals.had_error:
+    if g.had_error:
         return
 
     interpreter.visit_statements(result)
 
 
 def run_file(f):
-    run(Path(f).read_text(encoding="utf8"))
-    if Globals.had_error:
+    with open(f, encoding="utf-8") as fp:
+        source = fp.read()
+    run(source)
+    g = Globals
+    if g.had_error:
         exit(65)
-    if Globals.had_runtime_error:
+    if g.had_runtime_error:
         exit(70)
 
 
 def run_prompt():
+    g = Globals
+    readline = sys.stdin.readline
+    write = sys.stdout.write
+    flush = sys.stdout.flush
     while True:
-        print("> ", end="", flush=True)
-        inp = sys.stdin.readline()
+        write("> ")
+        flush()
+        inp = readline()
         if len(inp) == 0:
             break
         run(inp)
-        Globals.had_error = False
+        g.had_error = False
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
+    argv = sys.argv
+    argc = len(argv)
+    if argc > 2:
         print("Usage: plox [script]")
         exit(64)
-    elif len(sys.argv) == 2:
-        run_file(sys.argv[1])
+    elif argc == 2:
+        run_file(argv[1])
     else:
         run_prompt()
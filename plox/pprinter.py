@@ -1,20 +1,126 @@
+import re
+import sys
+from typing import Callable, Dict
+
 from .ast import *
 from .tokens import *
 
+INDENT_WIDTH = 4
+# Padding for each indentation level, deeper levels are built on demand
+_INDENTS = tuple(" " * (INDENT_WIDTH * i) for i in range(64))
+
+_NIL = sys.intern("nil")
+_TRUE = sys.intern("true")
+_FALSE = sys.intern("false")
+
+# Formatter for each literal type, anything else is printed with str. bool
+# must be matched by its exact type, True would also pass as an int.
+_LIT_FMT: Dict[type, Callable[[Any], str]] = {
+    type(None): lambda value: _NIL,
+    bool: lambda value: _TRUE if value else _FALSE,
+    str: lambda value: f'"{value}"',
+}
+
+_CHILD = re.compile(r"\{@(e(?:\.\w+)+)\}")
+
+
+# Visitor for each node type, looked up by the exact type of the node
+_VISITORS: Dict[type, Callable] = {}
+
+
+def _visits(node_type):
+    """
+    Registers the decorated function as the visitor of node_type.
+    """
+
+    def register(visitor):
+        _VISITORS[node_type] = visitor
+        return visitor
+
+    return register
+
+
+def _compile_template(node_type, template):
+    """
+    Generates and registers the visitor of node_type from a template, which
+    is the body of an f-string over the node `e`. A `{@e.field}` placeholder
+    prints that child node, dispatching directly through the printer table.
+
+    "(get {@e.object} {e.name.lexeme})"
+    """
+    name = f"visit_{node_type.__name__.lower()}"
+    lines = [
+        f"def {name}(self, e):",
+        "    buf = self._buf",
+        "    dispatch = self._DISPATCH",
+    ]
+    for i, part in enumerate(_CHILD.split(template)):
+        if i % 2 == 0:
+            if part:
+                lines.append(f"    buf.append(f{part!r})")
+        else:
+            lines.append(f"    child = {part}")
+            lines.append("    dispatch[type(child)](self, child)")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return _visits(node_type)(namespace[name])
+
+
+class LispPrinter:
+    """
+    Prints the program as lisp like s-expressions. Visitors don't return the
+    string, instead every fragment is appended to a single buffer that is
+    joined once at the end.
+    """
 
-class LispPrinter(ExprVisitor[str], StmtVisitor[str]):
     def __init__(self):
         self.indent = 0
+        self._pad = ""
+        self._buf: List[str] = []
+
+    def reset(self):
+        """
+        Clears the state left by previous prints, so the printer can be
+        reused even if a print didn't finish.
+        """
+        self.set_indent(0)
+        self._buf.clear()
 
     def print_program(self, program: Program):
-        return "\n".join([stmt.accept(self) for stmt in program])
+        buf = self._buf
+        buf.clear()
+        for i, stmt in enumerate(program):
+            if i > 0:
+                buf.append("\n")
+            self._p(stmt)
+        return "".join(buf)
+
+    def _p(self, node):
+        self._DISPATCH[type(node)](self, node)
+
+    def set_indent(self, level):
+        self.indent = level
+        if level < len(_INDENTS):
+            self._pad = _INDENTS[level]
+        else:
+            self._pad = " " * (INDENT_WIDTH * level)
 
-    def print_indent(self, s):
-        return " " * self.indent + s
+    def print_lines(self, nodes):
+        """
+        Prints each node in a new line at the current indentation.
+        """
+        append = self._buf.append
+        dispatch = self._DISPATCH
+        separator = "\n" + self._pad
+        for node in nodes:
+            append(separator)
+            dispatch[type(node)](self, node)
 
+    @_visits(Block)
     def visit_block(self, block: Block):
         """
-        Returns a lisp like string representation of the block.
+        Prints a lisp like representation of the block.
 
         (block)
 
@@ -24,78 +130,27 @@ class LispPrinter(ExprVisitor[str], StmtVisitor[str]):
             (print x)
             (print y))
         """
-        s = "(block"
+        self._buf.append("(block")
         if len(block.statements) > 0:
-            self.indent += 4
-            s += "\n" + "\n".join(
-                [self.print_indent(stmt.accept(self)) for stmt in block.statements]
-            )
-            self.indent -= 4
-        s += ")"
-        return s
+            self.set_indent(self.indent + 1)
+            self.print_lines(block.statements)
+            self.set_indent(self.indent - 1)
+        self._buf.append(")")
 
-    def visit_assign(self, expr: Assign) -> str:
-        """
-        Returns a lisp like string representation of the assignment.
-        (assign x (add x 1))
-        """
-        return f"(assign {expr.name.lexeme} {expr.value.accept(self)})"
-
-    def visit_binary(self, expr: Binary) -> str:
-        """
-        Returns a lisp like string representation of the binary expression.
-        (+ x 1)
+    @_visits(Literal)
+    def visit_literal(self, expr: Literal):
         """
-        return f"({expr.operator.lexeme} {expr.left.accept(self)} {expr.right.accept(self)})"
-
-    def visit_grouping(self, expr: Grouping) -> str:
-        """
-        Returns a lisp like string representation of the grouping expression.
-        (grouping (+ x 1))
-        """
-        return f"(grouping {expr.expression.accept(self)})"
-
-    def visit_literal(self, expr: Literal) -> str:
-        """
-        Returns a the string representation of the literal.
+        Prints the string representation of the literal.
         1
         "Hello"
         """
-        if expr.value is None:
-            return "nil"
-        elif expr.value is True:
-            return "true"
-        elif expr.value is False:
-            return "false"
-        elif isinstance(expr.value, str):
-            return f'"{expr.value}"'
-        else:
-            return str(expr.value)
-
-    def visit_unary(self, expr: Unary) -> str:
-        """
-        Returns a lisp like string representation of the unary expression.
-        (- x 1)
-        """
-        return f"({expr.operator} {expr.right.accept(self)})"
-
-    def visit_variable(self, expr: Variable) -> str:
-        """
-        Returns a lisp like string representation of the variable.
-        x
-        """
-        return expr.name.lexeme
-
-    def visit_print(self, expr: Print) -> str:
-        """
-        Returns a lisp like string representation of the print statement.
-        (print x)
-        """
-        return f"(print {expr.expression.accept(self)})"
+        value = expr.value
+        self._buf.append(_LIT_FMT.get(type(value), str)(value))
 
-    def visit_call(self, expr: Call) -> str:
+    @_visits(Call)
+    def visit_call(self, expr: Call):
         """
-        Returns a lisp like string representation of the call expression. Each
+        Prints a lisp like representation of the call expression. Each
         argument is printed as a separate line.
 
         (call f)
@@ -103,132 +158,130 @@ class LispPrinter(ExprVisitor[str], StmtVisitor[str]):
             (+ 1)
             2)
         """
-        s = f"(call {expr.callee.accept(self)}"
+        buf = self._buf
+        buf.append("(call ")
+        self._p(expr.callee)
         if len(expr.arguments) > 0:
-            self.indent += 4
-            s += "\n" + "\n".join(
-                [self.print_indent(arg.accept(self)) for arg in expr.arguments]
-            )
-            self.indent -= 4
-        s += ")"
-        return s
-
-    def visit_expression(self, stmt: Expression) -> str:
-        """
-        Returns a lisp like string representation of the expression statement.
-        (+ x 1)
-        """
-        return stmt.expression.accept(self)
+            self.set_indent(self.indent + 1)
+            self.print_lines(expr.arguments)
+            self.set_indent(self.indent - 1)
+        buf.append(")")
 
-    def visit_function(self, stmt: Function) -> str:
+    @_visits(Function)
+    def visit_function(self, stmt: Function):
         """
-        Returns a lisp like string representation of the function statement.
+        Prints a lisp like representation of the function statement.
         (func f (x y)
               (add x 1))
         """
-        s = f'(func {stmt.name.lexeme} ({" ".join([arg.lexeme for arg in stmt.params])})'
-        self.indent += 4
-        s += "\n" + "\n".join([self.print_indent(s.accept(self)) for s in stmt.body])
-        self.indent -= 4
-        s += ")"
-        return s
+        buf = self._buf
+        buf.append(
+            f'(func {stmt.name.lexeme} ({" ".join([arg.lexeme for arg in stmt.params])})'
+        )
+        self.set_indent(self.indent + 1)
+        if len(stmt.body) > 0:
+            self.print_lines(stmt.body)
+        else:
+            buf.append("\n")
+        self.set_indent(self.indent - 1)
+        buf.append(")")
 
-    def visit_if(self, stmt: If) -> str:
+    @_visits(If)
+    def visit_if(self, stmt: If):
         """
-        Returns a lisp like string representation of the if statement.
+        Prints a lisp like representation of the if statement.
         (if (x)
             (print x))
         """
-        s = f"(if {stmt.condition.accept(self)}"
-        self.indent += 4
-        s += "\n" + self.print_indent(stmt.then_branch.accept(self))
-        self.indent -= 4
+        buf = self._buf
+        buf.append("(if ")
+        self._p(stmt.condition)
+        self.set_indent(self.indent + 1)
+        self.print_lines([stmt.then_branch])
+        self.set_indent(self.indent - 1)
         if stmt.else_branch:
-            s += "\n" + self.print_indent(stmt.else_branch.accept(self))
-        s += ")"
-        return s
+            self.print_lines([stmt.else_branch])
+        buf.append(")")
 
-    def visit_while(self, stmt: While) -> str:
+    @_visits(While)
+    def visit_while(self, stmt: While):
         """
-        Returns a lisp like string representation of the while statement.
+        Prints a lisp like representation of the while statement.
         (while (x)
             (print x))
         """
-        s = f"(while {stmt.condition.accept(self)}"
-        self.indent += 4
-        s += "\n" + self.print_indent(stmt.body.accept(self))
-        self.indent -= 4
-        s += ")"
-        return s
+        buf = self._buf
+        buf.append("(while ")
+        self._p(stmt.condition)
+        self.set_indent(self.indent + 1)
+        self.print_lines([stmt.body])
+        self.set_indent(self.indent - 1)
+        buf.append(")")
 
-    def visit_return(self, stmt: Return) -> str:
+    @_visits(Return)
+    def visit_return(self, stmt: Return):
         """
-        Returns a lisp like string representation of the return statement.
+        Prints a lisp like representation of the return statement.
         (return x)
         """
+        buf = self._buf
         if stmt.value:
-            return f"(return {stmt.value.accept(self)})"
+            buf.append("(return ")
+            self._p(stmt.value)
+            buf.append(")")
         else:
-            return "(return)"
-
-    def visit_logical(self, expr: Logical) -> str:
-        """
-        Returns a lisp like string representation of the logical expression.
-        (or x y)
-        """
-        left = expr.left.accept(self)
-        right = expr.right.accept(self)
-        return f"({expr.operator.lexeme} {left} {right})"
+            buf.append("(return)")
 
-    def visit_var(self, stmt: Var) -> str:
+    @_visits(Var)
+    def visit_var(self, stmt: Var):
         """
-        Returns a lisp like string representation of the var statement.
+        Prints a lisp like representation of the var statement.
         (var x int)
         """
+        buf = self._buf
         if stmt.initializer:
-            return f"(var {stmt.name.lexeme} {stmt.initializer.accept(self)})"
+            buf.append(f"(var {stmt.name.lexeme} ")
+            self._p(stmt.initializer)
+            buf.append(")")
         else:
-            return f"(var {stmt.name.lexeme})"
+            buf.append(f"(var {stmt.name.lexeme})")
 
-    def visit_class(self, stmt: Class) -> str:
+    @_visits(Class)
+    def visit_class(self, stmt: Class):
         """
-        Returns a lisp like string representation of the class statement.
+        Prints a lisp like representation of the class statement.
         (class Test
             (func someFunc ()
                 (print "Ok")))
         """
-        s = f"(class {stmt.name.lexeme}"
+        buf = self._buf
+        buf.append(f"(class {stmt.name.lexeme}")
 
         if stmt.superclass:
-            s += f" (< {stmt.superclass.name.lexeme})"
+            buf.append(f" (< {stmt.superclass.name.lexeme})")
 
         if len(stmt.methods) > 0:
-            self.indent += 4
-            s += "\n" + "\n".join(
-                [self.print_indent(s.accept(self)) for s in stmt.methods]
-            )
-            self.indent -= 4
-        s += ")"
-        return s
-
-    def visit_get(self, expr: Get) -> str:
-        """
-        Returns a lisp like string representation of the get expression.
-        (get x y)
-        """
-        return f"(get {expr.object.accept(self)} {expr.name.lexeme})"
-
-    def visit_set(self, expr: Set) -> str:
-        """
-        Returns a lisp like string representation of the set expression.
-        (set x y value)
-        """
-        object = expr.object.accept(self)
-        value = expr.value.accept(self)
-        return f"(set {object} {expr.name.lexeme} {value})"
+            self.set_indent(self.indent + 1)
+            self.print_lines(stmt.methods)
+            self.set_indent(self.indent - 1)
+        buf.append(")")
 
-    def visit_this(self, _: This) -> str:
-        return f"this"
+    # Nodes that don't need indentation are printed by generated visitors
+    visit_assign = _compile_template(Assign, "(assign {e.name.lexeme} {@e.value})")
+    visit_binary = _compile_template(
+        Binary, "({e.operator.lexeme} {@e.left} {@e.right})"
+    )
+    visit_grouping = _compile_template(Grouping, "(grouping {@e.expression})")
+    visit_unary = _compile_template(Unary, "({e.operator} {@e.right})")
+    visit_variable = _compile_template(Variable, "{e.name.lexeme}")
+    visit_print = _compile_template(Print, "(print {@e.expression})")
+    visit_expression = _compile_template(Expression, "{@e.expression}")
+    visit_logical = _compile_template(
+        Logical, "({e.operator.lexeme} {@e.left} {@e.right})"
+    )
+    visit_get = _compile_template(Get, "(get {@e.object} {e.name.lexeme})")
+    visit_set = _compile_template(Set, "(set {@e.object} {e.name.lexeme} {@e.value})")
+    visit_this = _compile_template(This, "this")
+    visit_super = _compile_template(Super, "({e.keyword.lexeme} {e.method.lexeme})")
 
-    def visit_super(self, expr: Super) -> str:
-        return f"({expr.keyword.lexeme} {expr.method.lexeme})"
+    _DISPATCH = _VISITORS